@@ -7,6 +7,8 @@ class CustomFields(PolarionObject, ABC):
     def __init__(self, polarion, project, _id=None, uri=None):
         super().__init__(polarion, project, _id, uri)
         self.customFields = None
+        self._custom_fields_by_key = {}
+        self._custom_fields_indexed = None
 
     def isCustomFieldAllowed(self, key):
         raise NotImplementedError
@@ -18,20 +20,54 @@ class CustomFields(PolarionObject, ABC):
         :param value: custom field value
         :return: None
         """
-        if not self.isCustomFieldAllowed(key):
-            raise Exception(f"key {key} is not allowed for this workitem")
+        self.setCustomFields({key: value})
 
+    def setCustomFields(self, values):
+        """
+        Set multiple custom fields and save them at once
+        :param values: dict of custom field key to value
+        :return: None
+        """
+        for key in values:
+            if not self.isCustomFieldAllowed(key):
+                raise Exception(f"key {key} is not allowed for this workitem")
+
+        for key, value in values.items():
+            self._setCustomFieldValue(key, value)
+        self.save()
+
+    def _setCustomFieldValue(self, key, value):
+        """
+        Set the custom field 'key' to the value without saving
+        :param key: custom field key
+        :param value: custom field value
+        :return: None
+        """
         if self.customFields is None:
             # nothing exists, create a custom field structure
             self.customFields = self._polarion.ArrayOfCustomType()
-            self.customFields.Custom.append(self._polarion.CustomType(key=key, value=value))
+
+        custom_fields_by_key = self._getCustomFieldsByKey()
+        custom_field = custom_fields_by_key.get(key)
+        if custom_field is not None:
+            # custom field is there and we can update the value
+            custom_field.value = value
         else:
-            custom_field = next(
-                (custom_field for custom_field in self.customFields.Custom if custom_field["key"] == key), None)
-            if custom_field is not None:
-                # custom field is there and we can update the value
-                custom_field.value = value
-            else:
-                # custom field is not there, add it.
-                self.customFields.Custom.append(self._polarion.CustomType(key=key, value=value))
-        self.save()
+            # custom field is not there, add it.
+            custom_field = self._polarion.CustomType(key=key, value=value)
+            self.customFields.Custom.append(custom_field)
+            custom_fields_by_key[key] = custom_field
+
+    def _getCustomFieldsByKey(self):
+        """
+        Get the custom fields indexed by key. The index is rebuilt when customFields was replaced, for example on a
+        reload from Polarion.
+        :return: dict of key to custom field
+        """
+        if self._custom_fields_indexed is not self.customFields:
+            self._custom_fields_by_key = {}
+            if self.customFields is not None:
+                for custom_field in self.customFields.Custom:
+                    self._custom_fields_by_key.setdefault(custom_field['key'], custom_field)
+            self._custom_fields_indexed = self.customFields
+        return self._custom_fields_by_key
@@ -1,5 +1,8 @@
 import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
+
+_SUBTERRA_TYPE_RE = re.compile(r"\{(\w+)\}")
 
 
 class Creator(ABC):
@@ -14,24 +17,36 @@ creator_list = {}
 
 
 def addCreator(type_name, creator):
+    """
+    Register a creator for a subterra uri type.
+
+    :param type_name: The lower case type name in the uri
+    :param creator: A Creator class, or a callable taking (polarion, project, uri)
+    """
+    if isinstance(creator, type):
+        # creators are stateless, so a single instance can be shared by all calls
+        creator = creator().createFromUri
     creator_list[type_name] = creator
 
 
 def createFromUri(polarion, project, uri):
     type_name = _subterraUrl(uri)
-    if type_name in creator_list:
-        creator = creator_list[type_name]()
-        return creator.createFromUri(polarion, project, uri)
-    else:
+    create = creator_list.get(type_name)
+    if create is None:
         raise Exception(f'type {type_name} not supported')
+    return create(polarion, project, uri)
 
 
 def _subterraUrl(uri):
-    uri_parts = uri.split(':')
-    if uri_parts[0] != 'subterra':
+    if not uri.startswith('subterra:'):
         raise Exception(f'Not a subterra uri: {uri}')
-    uri_type = re.findall(r"{(\w+)}", uri)
-    if len(uri_type) >= 1:
-        return uri_type[0].lower()
+    return _subterraType(uri)
+
+
+@lru_cache(maxsize=4096)
+def _subterraType(uri):
+    uri_type = _SUBTERRA_TYPE_RE.search(uri)
+    if uri_type is not None:
+        return uri_type.group(1).lower()
     else:
         raise Exception(f'{uri} is not a valid polarion uri')
@@ -1,6 +1,9 @@
+from typing import List
+
+from zeep.helpers import serialize_object
+
 from .factory import Creator
 from .workitem import Workitem
-import copy
 
 
 class Plan(object):
@@ -47,14 +50,19 @@ class Plan(object):
 
     def _buildPlanFromPolarion(self):
         if self._polarion_record is not None and not self._polarion_record.unresolvable:
-            # parse all polarion attributes to this class
-            self._original_polarion = copy.deepcopy(self._polarion_record)
-            for attr, value in self._polarion_record.__dict__.items():
-                for key in value:
-                    setattr(self, key, value[key])
+            # parse all polarion attributes to this class and remember the original values for save(). They are
+            # serialized to plain python structures, so changes made in place (like status.id) are detected
+            values = {}
+            for value in self._polarion_record.__dict__.values():
+                values.update(value)
+            self.__dict__.update(values)
+            self._original_values = {key: serialize_object(value) for key, value in values.items()}
+            if self.allowedTypes is not None:
+                self._allowed_type_ids = frozenset(x.id for x in self.allowedTypes.EnumOptionId)
+            else:
+                self._allowed_type_ids = frozenset()
         else:
             raise Exception(f'Plan not retrieved from Polarion')
-        self._original_polarion = copy.deepcopy(self._polarion_record)
 
     def setDueDate(self, date):
         """
@@ -98,13 +106,24 @@ class Plan(object):
         :param workitem: Workitem
         :return: None
         """
-        if any(x.id == workitem.type.id for x in self.allowedTypes.EnumOptionId):
-            service = self._polarion.getService('Planning')
-            service.addPlanItems(self.uri, [workitem.uri])
-            workitem._reloadFromPolarion()  # noqa: call private to reload from polarion so the plan status is updated
-            self._reloadFromPolarion()
-        else:
-            raise Exception(f'Workitem type {workitem.id} is not allowed in this plan')
+        self.addToPlanBulk([workitem])
+
+    def addToPlanBulk(self, workitems: List[Workitem], reload_items=True):
+        """
+        Add multiple workitems to the plan using a single request
+        :param workitems: List of Workitems
+        :param reload_items: Set to False to skip reloading the workitems, their plan status will then be outdated
+        :return: None
+        """
+        for workitem in workitems:
+            if workitem.type.id not in self._allowed_type_ids:
+                raise Exception(f'Workitem type {workitem.id} is not allowed in this plan')
+        service = self._polarion.getService('Planning')
+        service.addPlanItems(self.uri, [workitem.uri for workitem in workitems])
+        if reload_items:
+            for workitem in workitems:
+                workitem._reloadFromPolarion()  # noqa: call private to reload from polarion so the plan status is updated
+        self._reloadFromPolarion()
 
     def removeFromPlan(self, workitem: Workitem):
         """
@@ -112,9 +131,20 @@ class Plan(object):
         :param workitem: Workitem
         :return: None
         """
+        self.removeFromPlanBulk([workitem])
+
+    def removeFromPlanBulk(self, workitems: List[Workitem], reload_items=True):
+        """
+        Remove multiple workitems from the plan using a single request
+        :param workitems: List of Workitems
+        :param reload_items: Set to False to skip reloading the workitems, their plan status will then be outdated
+        :return: None
+        """
         service = self._polarion.getService('Planning')
-        service.removePlanItems(self.uri, [workitem.uri])
-        workitem._reloadFromPolarion()  # noqa: call private to reload from polarion so the plan status is updated
+        service.removePlanItems(self.uri, [workitem.uri for workitem in workitems])
+        if reload_items:
+            for workitem in workitems:
+                workitem._reloadFromPolarion()  # noqa: call private to reload from polarion so the plan status is updated
         self._reloadFromPolarion()
 
     def addAllowedType(self, type):
@@ -123,7 +153,7 @@ class Plan(object):
         :param type: a string with the type name
         :return: None
         """
-        if any(x.id == type for x in self.allowedTypes.EnumOptionId) is False:
+        if type not in self._allowed_type_ids:
             service = self._polarion.getService('Planning')
             service.addPlanAllowedType(self.uri, self._polarion.EnumOptionIdType(id=type))
             self._reloadFromPolarion()
@@ -134,7 +164,7 @@ class Plan(object):
         :param type: a string with the type name
         :return: None
         """
-        if any(x.id == type for x in self.allowedTypes.EnumOptionId) is True:
+        if type in self._allowed_type_ids:
             service = self._polarion.getService('Planning')
             service.removePlanAllowedType(self.uri, self._polarion.EnumOptionIdType(id=type))
             self._reloadFromPolarion()
@@ -144,24 +174,16 @@ class Plan(object):
         Get all workitems from this plan
         :return: Array of workitems
         """
-        workitems = []
-        if self.records is not None:
-            for workitem in self.records.PlanRecord:
-                workitems.append(Workitem(self._polarion, self._project, polarion_workitem=workitem.item))
-        return workitems
+        if self.records is None:
+            return []
+        return [Workitem(self._polarion, self._project, polarion_workitem=record.item) for record in self.records.PlanRecord]
 
     def save(self):
         """
         Update the plan in polarion
         """
-        updated_plan = {}
-
-        for attr, value in self._polarion_record.__dict__.items():
-            for key in value:
-                current_value = getattr(self, key)
-                prev_value = getattr(self._original_polarion, key)
-                if current_value != prev_value:
-                    updated_plan[key] = current_value
+        current_values = ((key, getattr(self, key), prev_value) for key, prev_value in self._original_values.items())
+        updated_plan = {key: value for key, value, prev_value in current_values if serialize_object(value) != prev_value}
         if len(updated_plan) > 0:
             updated_plan['uri'] = self.uri
             service = self._polarion.getService('Planning')
@@ -192,7 +214,6 @@ class Plan(object):
         service = self._polarion.getService('Planning')
         self._polarion_record = service.getPlanByUri(self._polarion_record.uri)
         self._buildPlanFromPolarion()
-        self._original_polarion = copy.deepcopy(self._polarion_record)
 
     def __eq__(self, other):
         if self.id == other.id:
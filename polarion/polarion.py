@@ -1,5 +1,8 @@
 import atexit
+import os
 import re
+import time
+import uuid
 from urllib.parse import urljoin, urlparse
 import requests
 from zeep import Client, Transport
@@ -8,6 +11,35 @@ from zeep.plugins import HistoryPlugin
 from .project import Project
 
 _baseServiceUrl = 'ws/services'
+_authCheckInterval = 60.0
+_svnChunkSize = 65536
+# operation parameters (by index) that need to be nillable, so they can be sent as None
+_nillableFixups = {
+    'Tracker': [
+        ('addComment', 1),  # title, reply comments have no title
+        ('getModuleWorkItemUris', 1),
+        ('moveWorkItemToDocument', 2),
+    ],
+    'Planning': [
+        ('createPlan', 3),
+    ],
+}
+# types that can be accessed as attribute of the client, they are looked up on first use
+# TODO: check if the namespace is always the same
+_typeDefinitions = {
+    'EnumOptionIdType': ('TestManagement', 'ns3:EnumOptionId'),
+    'TextType': ('TestManagement', 'ns1:Text'),
+    'ArrayOfTestStepResultType': ('TestManagement', 'ns4:ArrayOfTestStepResult'),
+    'TestStepResultType': ('TestManagement', 'ns4:TestStepResult'),
+    'TestRecordType': ('TestManagement', 'ns4:TestRecord'),
+    'WorkItemType': ('Tracker', 'ns2:WorkItem'),
+    'LinkedWorkItemType': ('Tracker', 'ns2:LinkedWorkItem'),
+    'LinkedWorkItemArrayType': ('Tracker', 'ns2:ArrayOfLinkedWorkItem'),
+    'ArrayOfCustomType': ('Tracker', 'ns2:ArrayOfCustom'),
+    'CustomType': ('Tracker', 'ns2:Custom'),
+    'ArrayOfEnumOptionIdType': ('Tracker', 'ns2:ArrayOfEnumOptionId'),
+    'ArrayOfSubterraURIType': ('Tracker', 'ns1:ArrayOfSubterraURI'),
+}
 
 
 class Polarion(object):
@@ -29,8 +61,17 @@ class Polarion(object):
         self.url = polarion_url
         self.skip_cert_verification = skip_cert_verification
         self.svn_repo_url = svn_repo_url
+        self._svn_repo_root = None
+        if self.svn_repo_url is not None:
+            svn_root_url = urlparse(self.svn_repo_url)
+            self._svn_repo_root = f'{svn_root_url.scheme}://{svn_root_url.netloc}/{svn_root_url.path.strip("/")}'
 
         self.services = {}
+        # shared HTTP session for the non SOAP requests, so connections are reused
+        self._http = requests.Session()
+        self._http.verify = not self.skip_cert_verification
+        self._last_auth_check = time.monotonic()
+        self._auth_check_interval = _authCheckInterval
 
         if not self.url.endswith('/'):
             self.url += '/'
@@ -41,7 +82,6 @@ class Polarion(object):
         else:
             self._getServices()
         self._createSession()
-        self._getTypes()
 
         atexit.register(self._atexit_cleanup)
 
@@ -51,6 +91,7 @@ class Polarion(object):
         :return: None
         """
         self.services['Session']['client'].service.endSession()
+        self._http.close()
 
     def _getStaticServices(self):
         default_services = ['Session', 'Project', 'Tracker',
@@ -64,7 +105,7 @@ class Polarion(object):
         """
         Parse the list of services available in the overview
         """
-        service_overview = requests.get(self.url, verify=not self.skip_cert_verification)
+        service_overview = self._http.get(self.url)
         service_base_url = self.url + '/'
         if service_overview.ok:
             services = re.findall(r"(\w+)WebService", service_overview.text)
@@ -81,6 +122,7 @@ class Polarion(object):
             self.history = HistoryPlugin()
             self.services['Session']['client'] = Client(
                 self.services['Session']['url'] + '?wsdl', plugins=[self.history], transport=self._getTransport())
+            self.services['Session'].pop('svc', None)
             try:
                 self.sessionHeaderElement = None
                 self.services['Session']['client'].service.logIn(
@@ -93,6 +135,7 @@ class Polarion(object):
                     f'Could not log in to Polarion for user {self.user}')
             if self.sessionHeaderElement is not None:
                 self._updateServices()
+            self._last_auth_check = time.monotonic()
         else:
             raise Exception(
                 'Cannot login because WSDL has no SessionWebService')
@@ -105,38 +148,34 @@ class Polarion(object):
             raise Exception('Cannot update services when not logged in')
         for service in self.services:
             if service != 'Session':
-                if 'client' not in service:
+                if 'client' not in self.services[service]:
                     self.services[service]['client'] = Client(
                         self.services[service]['url'] + '?wsdl', transport=self._getTransport())
+                    self.services[service].pop('svc', None)
+                    self._applyNillableFixups(service)
                 self.services[service]['client'].set_default_soapheaders(
                     [self.sessionHeaderElement])
-            if service == 'Tracker':
-                if hasattr(self.services[service]['client'].service, 'addComment'):
-                    # allow addComment to be send without title, needed for reply comments
-                    self.services[service]['client'].service.addComment._proxy._binding.get(
-                        'addComment').input.body.type._element[1].nillable = True
-                    self.services[service]['client'].service.getModuleWorkItemUris._proxy._binding.get(
-                        'getModuleWorkItemUris').input.body.type._element[1].nillable = True
-                    self.services[service]['client'].service.moveWorkItemToDocument._proxy._binding.get(
-                        'moveWorkItemToDocument').input.body.type._element[2].nillable = True
-            if service == 'Planning':
-                self.services[service]['client'].service.createPlan._proxy._binding.get(
-                    'createPlan').input.body.type._element[3].nillable = True
-
-    def _getTypes(self):
-        # TODO: check if the namespace is always the same
-        self.EnumOptionIdType = self.getTypeFromService('TestManagement', 'ns3:EnumOptionId')
-        self.TextType = self.getTypeFromService('TestManagement', 'ns1:Text')
-        self.ArrayOfTestStepResultType = self.getTypeFromService('TestManagement', 'ns4:ArrayOfTestStepResult')
-        self.TestStepResultType = self.getTypeFromService('TestManagement', 'ns4:TestStepResult')
-        self.TestRecordType = self.getTypeFromService('TestManagement', 'ns4:TestRecord')
-        self.WorkItemType = self.getTypeFromService('Tracker', 'ns2:WorkItem')
-        self.LinkedWorkItemType = self.getTypeFromService('Tracker', 'ns2:LinkedWorkItem')
-        self.LinkedWorkItemArrayType = self.getTypeFromService('Tracker', 'ns2:ArrayOfLinkedWorkItem')
-        self.ArrayOfCustomType = self.getTypeFromService('Tracker', 'ns2:ArrayOfCustom')
-        self.CustomType = self.getTypeFromService('Tracker', 'ns2:Custom')
-        self.ArrayOfEnumOptionIdType = self.getTypeFromService('Tracker', 'ns2:ArrayOfEnumOptionId')
-        self.ArrayOfSubterraURIType = self.getTypeFromService('Tracker', 'ns1:ArrayOfSubterraURI')
+
+    def _applyNillableFixups(self, service):
+        """
+        Marks the operation parameters listed in _nillableFixups for this service as nillable
+        """
+        client_service = self.services[service]['client'].service
+        for operation, index in _nillableFixups.get(service, ()):
+            if hasattr(client_service, operation):
+                getattr(client_service, operation)._proxy._binding.get(
+                    operation).input.body.type._element[index].nillable = True
+
+    def __getattr__(self, name):
+        """
+        Resolves the types in _typeDefinitions on first use and stores them on the instance
+        """
+        if name in _typeDefinitions:
+            service, type_name = _typeDefinitions[name]
+            zeep_type = self.getTypeFromService(service, type_name)
+            setattr(self, name, zeep_type)
+            return zeep_type
+        raise AttributeError(f'{type(self).__name__} object has no attribute {name}')
 
     def _getTransport(self):
         """
@@ -154,19 +193,33 @@ class Polarion(object):
             return True
         return False
 
+    def getServiceNames(self):
+        """
+        Get the names of the available WSDL services
+
+        :return: A set of service names
+        :rtype: frozenset
+        """
+        return frozenset(self.services)
+
     def getService(self, name: str):
         """
         Get a WSDL service client. The name can be 'Trakcer' or 'Session'
         """
-        # request user info to see if we're still logged in
-        try:
-            _user = self.services['Project']['client'].service.getUser(self.user)
-        except Exception:
-            # if not, create a new session
-            self._createSession()
+        # request user info to see if we're still logged in, but not more often than the check interval
+        if time.monotonic() - self._last_auth_check > self._auth_check_interval:
+            try:
+                _user = self.services['Project']['client'].service.getUser(self.user)
+                self._last_auth_check = time.monotonic()
+            except Exception:
+                # if not, create a new session
+                self._createSession()
 
         if name in self.services:
-            return self.services[name]['client'].service
+            service = self.services[name]
+            if 'svc' not in service:
+                service['svc'] = service['client'].service
+            return service['svc']
         else:
             raise Exception('Service does not exsist')
 
@@ -188,27 +241,63 @@ class Polarion(object):
         return Project(self, project_id)
 
     def downloadFromSvn(self, url):
+        """
+        Download a file from the SVN repository
 
-        if self.svn_repo_url is not None:
+        :param url: The url of the file
+        :return: The file content
+        :rtype: bytes
+        """
+        with self._requestFromSvn(url) as resp:
+            return resp.content
+
+    def downloadFromSvnTo(self, url, file_path):
+        """
+        Download a file from the SVN repository and write it in chunks, without keeping the whole file in memory.
+        The file is only replaced when the download succeeded completely.
+
+        :param url: The url of the file
+        :param file_path: File where to save the download
+        """
+        with self._requestFromSvn(url) as resp:
+            # download to a temporary file next to the target, so a failed download leaves an existing file untouched
+            temp_path = f'{file_path}.{uuid.uuid4().hex}.part'
+            file = open(temp_path, 'xb')
+            try:
+                with file:
+                    for chunk in resp.iter_content(_svnChunkSize):
+                        file.write(chunk)
+                os.replace(temp_path, file_path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+
+    def _requestFromSvn(self, url):
+        """
+        Starts a streaming request for a file in the SVN repository. The caller must close the response.
+        """
+        if self._svn_repo_root is not None:
             # user specified new url to try, use that instead of the default value
             orig_url = urlparse(url)
             orig_url_path_without_repo = '/'.join(orig_url.path.split('/')[2:])
-            new_root_url = urlparse(self.svn_repo_url)
-            new_repo_url = f'{new_root_url.scheme}://{new_root_url.netloc}/{new_root_url.path.strip("/")}/{orig_url_path_without_repo}'
-            resp = requests.get(new_repo_url, auth=(self.user, self.password))
+            new_repo_url = f'{self._svn_repo_root}/{orig_url_path_without_repo}'
+            resp = self._http.get(new_repo_url, auth=(self.user, self.password), stream=True)
             if resp.ok:
-                return resp.content
+                return resp
+            resp.close()
             raise Exception(f'Could not download attachment from {url}. Got error {resp.status_code}: {resp.reason}')
         else:
             # try the url that was given
-            resp = requests.get(url, auth=(self.user, self.password))
+            resp = self._http.get(url, auth=(self.user, self.password), stream=True)
             if resp.ok:
-                return resp.content
+                return resp
+            resp.close()
 
             # if that fails then sneakily try downloading it with the default polarion SVN repo user and password
-            resp_default = requests.get(url, auth=('polarion', 'aurora'))
+            resp_default = self._http.get(url, auth=('polarion', 'aurora'), stream=True)
             if resp_default.ok:
-                return resp_default.content
+                return resp_default
+            resp_default.close()
 
             # if that also fails, tough luck.
             raise Exception(f'Could not download attachment from {url}. Got error {resp.status_code}: {resp.reason}.\n'
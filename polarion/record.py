@@ -170,16 +170,7 @@ class Record(object):
         :return: list of bytes
         :rtype: bytes[]
         """
-        # find the file
-        url = None
-        for attachment in self.attachments.TestRunAttachment:
-            if attachment.fileName == file_name:
-                url = attachment.url
-
-        if url is not None:
-            return self._polarion.downloadFromSvn(url)
-        else:
-            raise Exception(f'Could not find attachment with name {file_name}')
+        return self._polarion.downloadFromSvn(self._getAttachmentUrl(self.attachments, file_name))
 
     def saveAttachmentAsFile(self, file_name, file_path):
         """
@@ -188,9 +179,8 @@ class Record(object):
         :param file_name: The attachment file name
         :param file_path: File where to save the attachment
         """
-        bin = self.getAttachment(file_name)
-        with open(file_path, "wb") as file:
-            file.write(bin)
+        url = self._getAttachmentUrl(self.attachments, file_name)
+        self._polarion.downloadFromSvnTo(url, file_path)
 
     def deleteAttachment(self, file_name):
         """
@@ -210,7 +200,7 @@ class Record(object):
         :param title: The title of the attachment
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
+        file_name = os.path.basename(file_path)
         with open(file_path, "rb") as file_content:
             service.addAttachmentToTestRecord(self._test_run.uri, self._index, file_name, title, file_content.read())
         self._reloadFromPolarion()
@@ -238,16 +228,8 @@ class Record(object):
         :return: list of bytes
         :rtype: bytes[]
         """
-        # find the file
-        url = None
-        for attachment in self.testStepResults.TestStepResult[step_index].attachments.TestRunAttachment:
-            if attachment.fileName == file_name:
-                url = attachment.url
-
-        if url is not None:
-            return self._polarion.downloadFromSvn(url)
-        else:
-            raise Exception(f'Could not find attachment with name {file_name}')
+        attachments = self.testStepResults.TestStepResult[step_index].attachments
+        return self._polarion.downloadFromSvn(self._getAttachmentUrl(attachments, file_name))
 
     def saveAttachmentFromTestStepAsFile(self, step_index, file_name, file_path):
         """
@@ -257,9 +239,21 @@ class Record(object):
         :param file_name: The attachment file name
         :param file_path: File where to save the attachment
         """
-        bin = self.getAttachmentFromTestStep(step_index, file_name)
-        with open(file_path, "wb") as file:
-            file.write(bin)
+        attachments = self.testStepResults.TestStepResult[step_index].attachments
+        url = self._getAttachmentUrl(attachments, file_name)
+        self._polarion.downloadFromSvnTo(url, file_path)
+
+    def _getAttachmentUrl(self, attachments, file_name):
+        # find the file
+        url = None
+        for attachment in attachments.TestRunAttachment:
+            if attachment.fileName == file_name:
+                url = attachment.url
+
+        if url is not None:
+            return url
+        else:
+            raise Exception(f'Could not find attachment with name {file_name}')
 
     def deleteAttachmentFromTestStep(self, step_index, file_name):
         """
@@ -281,7 +275,7 @@ class Record(object):
         :param title: The title of the attachment
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
+        file_name = os.path.basename(file_path)
         with open(file_path, "rb") as file_content:
             service.addAttachmentToTestStep(self._test_run.uri, self._index, step_index, file_name, title, file_content.read())
         self._reloadFromPolarion()
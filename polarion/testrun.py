@@ -105,12 +105,7 @@ class Testrun(Comments):
         :return: list of bytes
         :rtype: bytes[]
         """
-        service = self._polarion.getService('TestManagement')
-        at = service.getTestRunAttachment(self.uri, file_name)
-
-        if at is not None:
-            return self._polarion.downloadFromSvn(at.url)
-        raise Exception(f'Could not download attachment {file_name}')
+        return self._polarion.downloadFromSvn(self._getAttachmentUrl(file_name))
 
     def saveAttachmentAsFile(self, file_name, file_path):
         """
@@ -119,9 +114,16 @@ class Testrun(Comments):
         :param file_name: The attachment file name
         :param file_path: File where to save the attachment
         """
-        bin = self.getAttachment(file_name)
-        with open(file_path, "wb") as file:
-            file.write(bin)
+        url = self._getAttachmentUrl(file_name)
+        self._polarion.downloadFromSvnTo(url, file_path)
+
+    def _getAttachmentUrl(self, file_name):
+        service = self._polarion.getService('TestManagement')
+        at = service.getTestRunAttachment(self.uri, file_name)
+
+        if at is not None:
+            return at.url
+        raise Exception(f'Could not download attachment {file_name}')
 
     def deleteAttachment(self, file_name):
         """
@@ -141,7 +143,7 @@ class Testrun(Comments):
         :param title: The title of the attachment
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
+        file_name = os.path.basename(file_path)
         with open(file_path, "rb") as file_content:
             service.addAttachmentToTestRun(self.uri, file_name, title, file_content.read())
         self._reloadFromPolarion()
@@ -164,7 +166,7 @@ class Testrun(Comments):
         :param title: The title of the attachment
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
+        file_name = os.path.basename(file_path)
         with open(file_path, "rb") as file_content:
             service.updateTestRunAttachment(self.uri, file_name, title, file_content.read())
         self._reloadFromPolarion()
@@ -21,9 +21,10 @@ class User(object):
 
         if self._polarion_record is not None and not self._polarion_record.unresolvable:
             # parse all polarion attributes to this class
-            for attr, value in self._polarion_record.__dict__.items():
-                for key in value:
-                    setattr(self, key, value[key])
+            values = {}
+            for value in self._polarion_record.__dict__.values():
+                values.update(value)
+            self.__dict__.update(values)
         else:
             raise Exception(f'User not retrieved from Polarion')
 
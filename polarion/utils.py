@@ -1,25 +1,31 @@
 import re
-from abc import ABC
 from html.parser import HTMLParser
 from polarion.project import Project
-from xml.etree import ElementTree
+from lxml import etree
 from texttable import Texttable
 
+# a negated class matches the same as '<.*?>' with DOTALL, but without the lazy quantifier backtracking
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+_NEWLINE_RE = re.compile('\n')
 
-class DescriptionParser(HTMLParser, ABC):
+
+class DescriptionParser(HTMLParser):
 
     def __init__(self, polarion_project: Project = None):
         """
         A HTMLParser with to cleaen the HTML tags from a string.
-        Can lookup Polarion links in HTML, present tables in a readable format and extracts formula's to text
+        Can lookup Polarion links in HTML, present tables in a readable format and extracts formula's to text.
+        The parser can be reused for multiple descriptions by calling reset() in between.
 
         @param polarion_project: A polarion project used to search for the title of a workitem if the link type is 'long'.
         """
         super(DescriptionParser, self).__init__()
         self._polarion_project = polarion_project
-        self._data = ''
+        self._data_parts = []
         self._table_start = None
         self._table_end = None
+        self._line_starts = None
+        self._line_starts_source = None
 
     @property
     def data(self):
@@ -27,7 +33,7 @@ class DescriptionParser(HTMLParser, ABC):
         The parsed data
         @return: string
         """
-        return self._data
+        return ''.join(self._data_parts)
 
     def reset(self):
         """
@@ -35,9 +41,11 @@ class DescriptionParser(HTMLParser, ABC):
         @return: None
         """
         super(DescriptionParser, self).reset()
-        self._data = ''
+        self._data_parts = []
         self._table_start = None
         self._table_end = None
+        self._line_starts = None
+        self._line_starts_source = None
 
     def handle_data(self, data):
         """
@@ -47,7 +55,7 @@ class DescriptionParser(HTMLParser, ABC):
         """
         # handle data outside of table content
         if self._table_start is None:
-            self._data += data
+            self._data_parts.append(data)
 
     def handle_starttag(self, tag, attrs):
         """
@@ -57,19 +65,16 @@ class DescriptionParser(HTMLParser, ABC):
         @param attrs: A tuple of attributes
         @return: None
         """
-        # parse attributes to dict
-        attributes = {}
-        for attribute, value in attrs:
-            attributes[attribute] = value
-
-        if tag == 'span' and 'class' in attributes:
-            if attributes['class'] == 'polarion-rte-link':
-                self._handle_polarion_rte_link(attributes)
-            elif attributes['class'] == 'polarion-rte-formula':
-                self._handle_polarion_rte_formula(attributes)
-
         if tag == 'table':
             self._table_start = self.getpos()
+        elif tag == 'span':
+            # only spans need their attributes parsed
+            attributes = dict(attrs)
+            span_class = attributes.get('class')
+            if span_class == 'polarion-rte-link':
+                self._handle_polarion_rte_link(attributes)
+            elif span_class == 'polarion-rte-formula':
+                self._handle_polarion_rte_formula(attributes)
 
     def handle_endtag(self, tag):
         """
@@ -85,23 +90,34 @@ class DescriptionParser(HTMLParser, ABC):
         Handles the HTML tables. It parses the table to a readable format.
         @return: None
         """
-        # get the table HTML content
+        # get the table HTML content, from the start of the table tag up to and including the end tag
         self._table_end = self.getpos()
-        table_content = self.rawdata.split('\n')
-        correct_lines = table_content[self._table_start[0] - 1:self._table_end[0]]
+        start = self._getRawdataOffset(self._table_start)
+        end = self.rawdata.find('>', self._getRawdataOffset(self._table_end)) + 1
         # iterate over table elements and parse to 2d array
-        table = ElementTree.XML(''.join(correct_lines))
+        table = etree.fromstring(self.rawdata[start:end].replace('\n', ''))
         content = []
         for tr in table.iter('tr'):
-            content.append([])
-            for th in tr.iter('th'):
-                content[-1].append(th.text)
-            for td in tr.iter('td'):
-                content[-1].append(td.text)
-        self._data += Texttable().add_rows(content).draw()
+            content.append([cell.text for cell in tr if cell.tag in ('th', 'td')])
+        # a new Texttable per table on purpose: reset() keeps the column widths and alignment of the previous table
+        self._data_parts.append(Texttable().add_rows(content).draw())
         self._table_start = None
         self._table_end = None
 
+    def _getRawdataOffset(self, position):
+        """
+        Converts a position as returned by getpos() to an offset in the raw data.
+        The line start offsets are calculated once for the raw data that is being parsed.
+        @param position: A tuple of line number and column
+        @return: offset in rawdata
+        """
+        if self._line_starts_source is not self.rawdata:
+            self._line_starts = [0]
+            self._line_starts.extend(match.end() for match in _NEWLINE_RE.finditer(self.rawdata))
+            self._line_starts_source = self.rawdata
+        line, column = position
+        return self._line_starts[line - 1] + column
+
     def _handle_polarion_rte_link(self, attributes):
         """
         Gets either the workitem id from a link (short) or the workitem id and title (long)
@@ -110,10 +126,10 @@ class DescriptionParser(HTMLParser, ABC):
         """
         if attributes['data-option-id'] == 'short' or (
                 attributes['data-option-id'] == 'long' and self._polarion_project is None):
-            self._data += attributes['data-item-id']
+            self._data_parts.append(attributes['data-item-id'])
         else:
             linked_item = self._polarion_project.getWorkitem(attributes['data-item-id'])
-            self._data += str(linked_item)
+            self._data_parts.append(str(linked_item))
 
     def _handle_polarion_rte_formula(self, attributes):
         """
@@ -121,7 +137,7 @@ class DescriptionParser(HTMLParser, ABC):
         @param attributes: attributes to the formula tag
         @return: None
         """
-        self._data += attributes['data-source']
+        self._data_parts.append(attributes['data-source'])
 
 
 
@@ -131,6 +147,4 @@ def strip_html(raw_html):
     :param raw_html: HTML string
     :return: plain text string
     """
-    clean = re.compile('<.*?>')
-    clean_text = re.sub(clean, '', raw_html)
-    return clean_text
\ No newline at end of file
+    return _HTML_TAG_RE.sub('', raw_html)
\ No newline at end of file
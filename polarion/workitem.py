@@ -1,9 +1,12 @@
-import copy
+import mmap
 import os
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, date
 from enum import Enum
 
 from zeep import xsd
+from zeep.helpers import serialize_object
 
 from .base.comments import Comments
 from .base.custom_fields import CustomFields
@@ -11,6 +14,58 @@ from .factory import Creator
 from .user import User
 
 
+@contextmanager
+def _mapFile(file_path):
+    """
+    Opens a file as read only memory map, so the content can be encoded for upload without reading it into memory first
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # an empty file cannot be mapped
+            yield b''
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as file_content:
+                yield file_content
+
+
+def _compareValues(a, b, pairs):
+    # direct compare capable
+    return a == b
+
+
+def _compareLists(a, b, pairs):
+    # compare the list items one by one
+    if len(a) != len(b):
+        return False
+    pairs.extend(zip(a, b))
+    return True
+
+
+def _compareMappings(a, b, pairs):
+    for key in a:
+        if key.startswith('_'):
+            # skip private types
+            continue
+        if key not in b:
+            return False
+        pairs.append((a[key], b[key]))
+    return True
+
+
+# compare handler per type. zeep object types are not added, zeep creates new classes for every loaded client
+_compareHandlers = {
+    int: _compareValues,
+    float: _compareValues,
+    bool: _compareValues,
+    type(None): _compareValues,
+    str: _compareValues,
+    datetime: _compareValues,
+    date: _compareValues,
+    list: _compareLists,
+    dict: _compareMappings,
+}
+
+
 class Workitem(CustomFields, Comments):
     """
     Create a Polarion workitem object either from and id or from an Polarion uri.
@@ -36,8 +91,9 @@ class Workitem(CustomFields, Comments):
         self._project = project
         self._id = id
         self._uri = uri
+        self._revision = None
 
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
 
         if self._uri:
             try:
@@ -55,24 +111,25 @@ class Workitem(CustomFields, Comments):
                     f'Cannot find workitem {self._id} in project {self._project.id}')
         elif new_workitem_type is not None:
             # construct empty workitem
-            self._polarion_item = self._polarion.WorkItemType(
-                type=self._polarion.EnumOptionIdType(id=new_workitem_type))
+            workitem_type = self._polarion.EnumOptionIdType(id=new_workitem_type)
+            self._polarion_item = self._polarion.WorkItemType(type=workitem_type)
             self._polarion_item.project = self._project.polarion_data
 
             # get the required field for a new item
-            required_features = service.getInitialWorkflowActionForProjectAndType(self._project.id, self._polarion.EnumOptionIdType(id=new_workitem_type))
+            required_features = service.getInitialWorkflowActionForProjectAndType(self._project.id, workitem_type)
             if required_features.requiredFeatures is not None:
                 # if there are any, go and check if they are all supplied
-                if new_workitem_fields is None or not set(required_features.requiredFeatures.item) <= new_workitem_fields.keys():
+                if new_workitem_fields is None or any(field not in new_workitem_fields for field in required_features.requiredFeatures.item):
                     # let the user know with a better error
                     raise Exception(f'New workitem required field: {required_features.requiredFeatures.item} to be filled in using new_workitem_fields')
 
             if new_workitem_fields is not None:
-                for new_field in new_workitem_fields:
-                    if new_field in self._polarion_item:
-                        self._polarion_item[new_field] = new_workitem_fields[new_field]
-                    else:
-                        raise Exception(f'{new_field} in new_workitem_fields is not recognised as a workitem field')
+                # check all fields before filling any in, the field names of the workitem type are collected once
+                unknown_fields = new_workitem_fields.keys() - frozenset(self._polarion_item)
+                if len(unknown_fields) > 0:
+                    raise Exception(f'{", ".join(sorted(unknown_fields))} in new_workitem_fields is not recognised as a workitem field')
+                for new_field, value in new_workitem_fields.items():
+                    self._polarion_item[new_field] = value
 
             # and create it
             new_uri = service.createWorkItem(self._polarion_item)
@@ -88,42 +145,78 @@ class Workitem(CustomFields, Comments):
 
         self._buildWorkitemFromPolarion()
 
+    @property
+    def _tracker(self):
+        """
+        The Tracker service. Requested from the client on each use, so the client can renew the session if needed.
+        """
+        return self._polarion.getService('Tracker')
+
+    @property
+    def _test_management(self):
+        """
+        The TestManagement service. Requested from the client on each use, so the client can renew the session if needed.
+        """
+        return self._polarion.getService('TestManagement')
+
     def _buildWorkitemFromPolarion(self):
         if self._polarion_item is not None and not self._polarion_item.unresolvable:
-            self._original_polarion = copy.deepcopy(self._polarion_item)
-            for attr, value in self._polarion_item.__dict__.items():
-                for key in value:
-                    setattr(self, key, value[key])
-            self._polarion_test_steps = None
-            try:
-                # get the custom fields
-                service = self._polarion.getService('Tracker')
-                custom_fields = service.getCustomFieldTypes(self.uri)
-                # check if any of the field has the test steps
-                if any(field.id == 'testSteps' for field in custom_fields):
-                    service_test = self._polarion.getService('TestManagement')
-                    self._polarion_test_steps = service_test.getTestSteps(self.uri)
-            except Exception as  e:
-                # fail silently as there are probably not test steps for this workitem
-                # todo: logging support
-                pass
-            self._parsed_test_steps = None
-            if self._polarion_test_steps is not None:
-                if self._polarion_test_steps.keys is not None and self._polarion_test_steps.steps:
-                    # oh god, parse the test steps...
-                    columns = []
-                    self._parsed_test_steps = []
-                    for col in self._polarion_test_steps.keys.EnumOptionId:
-                        columns.append(col.id)
-                    # now parse the rows
-                    for row in self._polarion_test_steps.steps.TestStep:
-                        current_row = {}
-                        for col_id in range(len(row.values.Text)):
-                            current_row[columns[col_id]] = row.values.Text[col_id].content
-                        self._parsed_test_steps.append(current_row)
+            # remember the original values for save(). They are serialized to plain python structures, so changes made
+            # in place (like status.id) are detected and this is a lot cheaper than a deepcopy of the zeep objects
+            values = {}
+            for value in self._polarion_item.__dict__.values():
+                values.update(value)
+            # all fields are written on purpose, also unchanged ones: a reload has to discard unsaved local changes
+            self.__dict__.update(values)
+            self._original_values = {key: serialize_object(value) for key, value in values.items()}
+            self._public_keys = None
+            # data that needs extra requests is kept as long as the revision did not change
+            revision = getattr(self._polarion_item, 'revision', None)
+            if revision is None or revision != self._revision:
+                # the test steps are loaded on first use
+                self._test_steps_loaded = False
+                self._allowed_custom_keys = None
+                self._allowed_custom_key_set = None
+            self._revision = revision
         else:
             raise Exception(f'Workitem not retrieved from Polarion')
 
+    @property
+    def _parsed_test_steps(self):
+        """
+        The test steps as a list of dicts with a key per column, or None if the workitem has no test steps.
+        They are requested from Polarion on first use.
+        """
+        if not self._test_steps_loaded:
+            self._loadTestSteps()
+        return self._parsed_test_steps_cache
+
+    def _loadTestSteps(self):
+        self._polarion_test_steps = None
+        try:
+            # get the custom fields
+            service = self._tracker
+            custom_fields = service.getCustomFieldTypes(self.uri)
+            # check if any of the field has the test steps
+            if any(field.id == 'testSteps' for field in custom_fields):
+                service_test = self._test_management
+                self._polarion_test_steps = service_test.getTestSteps(self.uri)
+        except Exception as  e:
+            # fail silently as there are probably not test steps for this workitem
+            # todo: logging support
+            pass
+        self._parsed_test_steps_cache = None
+        if self._polarion_test_steps is not None:
+            if self._polarion_test_steps.keys is not None and self._polarion_test_steps.steps:
+                # oh god, parse the test steps...
+                columns = [col.id for col in self._polarion_test_steps.keys.EnumOptionId]
+                # now parse the rows, mapping each column to the content of its cell
+                self._parsed_test_steps_cache = [
+                    dict(zip(columns, (text.content for text in row.values.Text)))
+                    for row in self._polarion_test_steps.steps.TestStep
+                ]
+        self._test_steps_loaded = True
+
     def getAuthor(self):
         """
         Get the author of the workitem
@@ -141,7 +234,7 @@ class Workitem(CustomFields, Comments):
 
         :param user: The user object to remove
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.removeApprovee(self.uri, user.id)
         self._reloadFromPolarion()
 
@@ -152,14 +245,20 @@ class Workitem(CustomFields, Comments):
         :param user: The user object to add
         :param remove_others: Set to True to make the new user the only approver user.
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
+        if self.approvals is not None:
+            current_user_ids = [approval.user.id for approval in self.approvals.Approval]
+        else:
+            current_user_ids = []
 
         if remove_others:
-            current_users = self.getApproverUsers()
-            for current_user in current_users:
-                service.removeApprovee(self.uri, current_user.id)
+            # approvals cannot be replaced with an update, so remove the others one by one
+            for current_user_id in current_user_ids:
+                if current_user_id != user.id:
+                    service.removeApprovee(self.uri, current_user_id)
 
-        service.addApprovee(self.uri, user.id)
+        if user.id not in current_user_ids:
+            service.addApprovee(self.uri, user.id)
         self._reloadFromPolarion()
 
     def getApproverUsers(self):
@@ -169,11 +268,9 @@ class Workitem(CustomFields, Comments):
         :return: An array of User objects
         :rtype: User[]
         """
-        assigned_users = []
         if self.approvals is not None:
-            for approval in self.approvals.Approval:
-                assigned_users.append(User(self._polarion, approval.user))
-        return assigned_users
+            return [User(self._polarion, approval.user) for approval in self.approvals.Approval]
+        return []
 
     def getAssignedUsers(self):
         """
@@ -182,11 +279,9 @@ class Workitem(CustomFields, Comments):
         :return: An array of User objects
         :rtype: User[]
         """
-        assigned_users = []
         if self.assignee is not None:
-            for user in self.assignee.User:
-                assigned_users.append(User(self._polarion, user))
-        return assigned_users
+            return [User(self._polarion, user) for user in self.assignee.User]
+        return []
 
     def removeAssignee(self, user: User):
         """
@@ -194,7 +289,7 @@ class Workitem(CustomFields, Comments):
 
         :param user: The user object to remove
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.removeAssignee(self.uri, user.id)
         self._reloadFromPolarion()
 
@@ -205,14 +300,13 @@ class Workitem(CustomFields, Comments):
         :param user: The user object to add
         :param remove_others: Set to True to make the new user the only assigned user.
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
 
         if remove_others:
-            current_users = self.getAssignedUsers()
-            for current_user in current_users:
-                service.removeAssignee(self.uri, current_user.id)
-
-        service.addAssignee(self.uri, user.id)
+            # replace all assignees with a single update
+            service.updateWorkItem({'uri': self.uri, 'assignee': {'User': [{'uri': user.uri}]}})
+        else:
+            service.addAssignee(self.uri, user.id)
         self._reloadFromPolarion()
 
     def getStatusEnum(self):
@@ -260,15 +354,14 @@ class Workitem(CustomFields, Comments):
     def getAllowedCustomKeys(self):
         """
         Gets the list of keys that the workitem is allowed to have.
+        The keys are requested once and cached until the workitem is reloaded.
 
         :return: An array of strings of the keys
         :rtype: string[]
         """
-        try:
-            service = self._polarion.getService('Tracker')
-            return service.getCustomFieldKeys(self.uri)
-        except Exception:
+        if not self._loadAllowedCustomKeys():
             return []
+        return list(self._allowed_custom_keys)
 
     def isCustomFieldAllowed(self, key):
         """
@@ -277,7 +370,26 @@ class Workitem(CustomFields, Comments):
         :return: If the field is allowed
         :rtype: bool
         """
-        return key in self.getAllowedCustomKeys()
+        if not self._loadAllowedCustomKeys():
+            return False
+        return key in self._allowed_custom_key_set
+
+    def _loadAllowedCustomKeys(self):
+        """
+        Requests the allowed custom keys, unless they are cached already. A failed request is not cached, so it is
+        tried again next time.
+
+        :return: True if the allowed custom keys are available
+        """
+        if self._allowed_custom_keys is None:
+            try:
+                service = self._tracker
+                keys = list(service.getCustomFieldKeys(self.uri) or [])
+            except Exception:
+                return False
+            self._allowed_custom_keys = keys
+            self._allowed_custom_key_set = frozenset(keys)
+        return True
 
     def getAvailableStatus(self):
         """
@@ -286,12 +398,8 @@ class Workitem(CustomFields, Comments):
         :return: An array of string of the statusses
         :rtype: string[]
         """
-        available_status = []
-        service = self._polarion.getService('Tracker')
-        av_status = service.getAvailableEnumOptionIdsForId(self.uri, 'status')
-        for status in av_status:
-            available_status.append(status.id)
-        return available_status
+        service = self._tracker
+        return [status.id for status in service.getAvailableEnumOptionIdsForId(self.uri, 'status')]
 
     def getAvailableActionsDetails(self):
         """
@@ -300,12 +408,8 @@ class Workitem(CustomFields, Comments):
         :return: An array of dictionaries of the actions
         :rtype: dict[]
         """
-        available_actions = []
-        service = self._polarion.getService('Tracker')
-        av_actions = service.getAvailableActions(self.uri)
-        for action in av_actions:
-            available_actions.append(action)
-        return available_actions
+        service = self._tracker
+        return list(service.getAvailableActions(self.uri))
 
     def getAvailableActions(self):
         """
@@ -314,12 +418,8 @@ class Workitem(CustomFields, Comments):
         :return: An array of strings of the actions
         :rtype: string[]
         """
-        available_actions = []
-        service = self._polarion.getService('Tracker')
-        av_actions = service.getAvailableActions(self.uri)
-        for action in av_actions:
-            available_actions.append(action.nativeActionId)
-        return available_actions
+        service = self._tracker
+        return [action.nativeActionId for action in service.getAvailableActions(self.uri)]
 
     def performAction(self, action_name):
         """
@@ -327,12 +427,14 @@ class Workitem(CustomFields, Comments):
 
         :param action_name: string containing the action name
         """
-        # get id from action name
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         av_actions = service.getAvailableActions(self.uri)
-        for action in av_actions:
-            if action.nativeActionId == action_name or action.actionName == action_name:
-                service.performWorkflowAction(self.uri, action.actionId)
+        # index the actions by both name and native id, the native id wins when they clash
+        actions_by_name = {action.actionName: action.actionId for action in av_actions}
+        actions_by_name.update((action.nativeActionId, action.actionId) for action in av_actions)
+        action_id = actions_by_name.get(action_name)
+        if action_id is not None:
+            service.performWorkflowAction(self.uri, action_id)
 
     def performActionId(self, actionId: int):
         """
@@ -340,7 +442,7 @@ class Workitem(CustomFields, Comments):
 
         :param actionId: number for the action to perform
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.performWorkflowAction(self.uri, actionId)
 
     def setStatus(self, status):
@@ -406,7 +508,7 @@ class Workitem(CustomFields, Comments):
         :param url: The URL to add
         :param hyperlink_type: Select internal or external hyperlink
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.addHyperlink(self.uri, url, {'id': hyperlink_type.value})
         self._reloadFromPolarion()
 
@@ -418,7 +520,7 @@ class Workitem(CustomFields, Comments):
             :param link_type: The link type
         """
 
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.addLinkedItem(self.uri, workitem.uri, role={'id': link_type})
         self._reloadFromPolarion()
         workitem._reloadFromPolarion()
@@ -432,18 +534,24 @@ class Workitem(CustomFields, Comments):
         :param role: the role to remove
         :return: None
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         if role is not None:
             service.removeLinkedItem(self.uri, workitem.uri, role={'id': role})
         else:
+            # collect the (source, target, role) of every link with the workitem, both directions
+            links = []
             if self.linkedWorkItems is not None:
-                for linked_item in self.linkedWorkItems.LinkedWorkItem:
-                    if linked_item.workItemURI == workitem.uri:
-                        service.removeLinkedItem(self.uri, linked_item.workItemURI, role=linked_item.role)
+                links += [(self.uri, workitem.uri, linked_item.role) for linked_item in self.linkedWorkItems.LinkedWorkItem
+                          if linked_item.workItemURI == workitem.uri]
             if self.linkedWorkItemsDerived is not None:
-                for linked_item in self.linkedWorkItemsDerived.LinkedWorkItem:
-                    if linked_item.workItemURI == workitem.uri:
-                        service.removeLinkedItem(linked_item.workItemURI, self.uri, role=linked_item.role)
+                links += [(workitem.uri, self.uri, linked_item.role) for linked_item in
+                          self.linkedWorkItemsDerived.LinkedWorkItem if linked_item.workItemURI == workitem.uri]
+            # a link can be listed more than once (for example for different revisions), remove it only once
+            removed = set()
+            for source, target, link_role in links:
+                if (source, target, link_role.id) not in removed:
+                    removed.add((source, target, link_role.id))
+                    service.removeLinkedItem(source, target, role=link_role)
         self._reloadFromPolarion()
         workitem._reloadFromPolarion()
 
@@ -466,7 +574,7 @@ class Workitem(CustomFields, Comments):
         :return: list of bytes
         :rtype: bytes[]
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         return service.getAttachment(self.uri, id)
 
     def saveAttachmentAsFile(self, id, file_path):
@@ -486,7 +594,7 @@ class Workitem(CustomFields, Comments):
 
         :param id: The attachment id
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.deleteAttachment(self.uri, id)
         self._reloadFromPolarion()
 
@@ -497,10 +605,10 @@ class Workitem(CustomFields, Comments):
         :param file_path: Source file to upload
         :param title: The title of the attachment
         """
-        service = self._polarion.getService('Tracker')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.createAttachment(self.uri, file_name, title, file_content.read())
+        service = self._tracker
+        file_name = os.path.basename(file_path)
+        with _mapFile(file_path) as file_content:
+            service.createAttachment(self.uri, file_name, title, file_content)
         self._reloadFromPolarion()
 
     def updateAttachment(self, id, file_path, title):
@@ -511,17 +619,17 @@ class Workitem(CustomFields, Comments):
         :param file_path: Source file to upload
         :param title: The title of the attachment
         """
-        service = self._polarion.getService('Tracker')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.updateAttachment(self.uri, id, file_name, title, file_content.read())
+        service = self._tracker
+        file_name = os.path.basename(file_path)
+        with _mapFile(file_path) as file_content:
+            service.updateAttachment(self.uri, id, file_name, title, file_content)
         self._reloadFromPolarion()
 
     def delete(self):
         """
         Delete the work item in polarion
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.deleteWorkItem(self.uri)
 
     def moveToDocument(self, document, parent):
@@ -531,68 +639,76 @@ class Workitem(CustomFields, Comments):
         :param document: Target document
         :param parent: Parent workitem, None if it shall be placed as top item
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.moveWorkItemToDocument(self.uri, document.uri, parent.uri if parent is not None else xsd.const.Nil, -1,
                                        False)
 
-    def save(self):
+    def save(self, reload=True):
         """
         Update the workitem in polarion
+
+        :param reload: Set to False to skip reloading the workitem after the update, for example when editing many
+         workitems. Fields that Polarion updates itself, like the updated date, will then be outdated.
         """
         updated_item = {}
-
-        for attr, value in self._polarion_item.__dict__.items():
-            for key in value:
-                current_value = getattr(self, key)
-                prev_value = getattr(self._original_polarion, key)
-                if current_value != prev_value:
-                    updated_item[key] = current_value
+        updated_values = {}
+
+        for key, prev_value in self._original_values.items():
+            current_value = getattr(self, key)
+            current_serialized = serialize_object(current_value)
+            if current_serialized != prev_value:
+                updated_item[key] = current_value
+                updated_values[key] = current_serialized
         if len(updated_item) > 0:
             updated_item['uri'] = self.uri
-            service = self._polarion.getService('Tracker')
+            service = self._tracker
             service.updateWorkItem(updated_item)
-            self._reloadFromPolarion()
+            if reload:
+                self._reloadFromPolarion()
+            else:
+                # the values that were sent are the new original values
+                self._original_values.update(updated_values)
 
     def _reloadFromPolarion(self):
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         self._polarion_item = service.getWorkItemByUri(self._polarion_item.uri)
         self._buildWorkitemFromPolarion()
-        self._original_polarion = copy.deepcopy(self._polarion_item)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         try:
             a = vars(self)
             b = vars(other)
         except Exception:
             return False
-        return self._compareType(a, b)
+        return self._compareType(a, b, self._getPublicKeys())
 
-    def _compareType(self, a, b):
-        basic_types = [int, float,
-                       bool, type(None), str, datetime, date]
+    def _getPublicKeys(self):
+        """
+        The names of the public attributes, which are compared by __eq__. Cached until the workitem is rebuilt.
+        """
+        if self._public_keys is None:
+            self._public_keys = frozenset(key for key in vars(self) if not key.startswith('_'))
+        return self._public_keys
 
-        for key in a:
-            if key.startswith('_'):
-                # skip private types
-                continue
+    def _compareType(self, a, b, keys):
+        pairs = deque()
+        for key in keys:
+            if key not in b:
+                return False
+            pairs.append((a[key], b[key]))
+        while pairs:
+            a, b = pairs.pop()
             # first to a quick type compare to catch any easy differences
-            if type(a[key]) == type(b[key]):
-                if type(a[key]) in basic_types:
-                    # direct compare capable
-                    if a[key] != b[key]:
-                        return False
-                elif isinstance(a[key], list):
-                    # special case for list items
-                    if len(a[key]) != len(b[key]):
-                        return False
-                    for idx, sub_a in enumerate(a[key]):
-                        self._compareType(sub_a, b[key][idx])
-                else:
-                    if not self._compareType(a[key], b[key]):
-                        return False
-            else:
+            if type(a) != type(b):
                 # exit, type mismatch
                 return False
+            handler = _compareHandlers.get(type(a))
+            if handler is None:
+                handler = _compareMappings if isinstance(a, (dict, xsd.CompoundValue)) else _compareValues
+            if not handler(a, b, pairs):
+                return False
         # survived all exits, must be good then
         return True
 
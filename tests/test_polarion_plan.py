@@ -36,6 +36,24 @@ class TestPolarionPlan(unittest.TestCase):
         self.assertEqual(len(workitems_in_plan_start) - 1, len(workitems_in_plan_end),
                          msg='Workitems in plan did not decrease by 1')
 
+    def test_add_remove_workitems_bulk(self):
+        workitem_packages = [self.executing_project.createWorkitem('workpackage') for _ in range(3)]
+
+        workitems_in_plan_start = self.executing_plan.getWorkitemsInPlan()
+        self.executing_plan.addToPlanBulk(workitem_packages)
+        workitems_in_plan_end = self.executing_plan.getWorkitemsInPlan()
+
+        for workitem_package in workitem_packages:
+            self.assertEqual(workitem_package.plannedInURIs.SubterraURI[0], self.executing_plan.uri, msg='Plan in workitem does not match current plan')
+        self.assertEqual(len(workitems_in_plan_start) + 3, len(workitems_in_plan_end), msg='Workitems in plan did not increase by 3')
+
+        self.executing_plan.removeFromPlanBulk(workitem_packages)
+
+        for workitem_package in workitem_packages:
+            self.assertIsNone(workitem_package.plannedInURIs, msg='Workitem still in plan')
+        self.assertEqual(len(workitems_in_plan_start), len(self.executing_plan.getWorkitemsInPlan()),
+                         msg='Workitems in plan did not decrease by 3')
+
     def test_add_remove_workitem_new_type(self):
         workitem_task = self.executing_project.createWorkitem('task')
 
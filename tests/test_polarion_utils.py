@@ -13,6 +13,13 @@ class TestPolarionUtils(unittest.TestCase):
 
         self.assertEqual(core_text, clean_text, msg="Cleaned text was not equal to expected core text")
 
+    def test_clean_html_multiline_tag(self):
+        html_text = '<p\n class="a">text<br\n/> 1 &lt; 2</p>'
+
+        clean_text = strip_html(html_text)
+
+        self.assertEqual('text 1 &lt; 2', clean_text, msg="Cleaned text was not equal to expected core text")
+
     def test_html_formatter(self):
         html_text = """big text<br/>
                         normal text<br/>
@@ -49,6 +56,40 @@ class TestPolarionUtils(unittest.TestCase):
 
         self.assertEqual(expected_output, actual_output, msg='Parser result deviated from expected.')
 
+    def test_html_formatter_multiple_tables(self):
+        html_text = """first<table><tr><th>1</th><th>2</th></tr>
+                        <tr><td>3</td><td>4</td></tr></table>second<br/>
+                        <table><tr><td>5</td></tr></table>third"""
+
+        expected_output = ('first'
+                           '+---+---+\n'
+                           '| 1 | 2 |\n'
+                           '+===+===+\n'
+                           '| 3 | 4 |\n'
+                           '+---+---+'
+                           'second\n'
+                           '+---+\n'
+                           '| 5 |\n'
+                           '+===+\n'
+                           '+---+'
+                           'third')
+
+        parser = DescriptionParser()
+        parser.feed(html_text)
+
+        self.assertEqual(expected_output.replace(" ", ""), parser.data.replace(" ", ""),
+                         msg='Parser result deviated from expected.')
+
+    def test_html_formatter_reuse(self):
+        parser = DescriptionParser()
+
+        parser.feed('first<br/><table><tr><td>1</td><td>2</td></tr></table>')
+        parser.reset()
+        parser.feed('second<br/><table><tr><td>3</td></tr></table>')
+
+        self.assertEqual('second+---+|3|+===++---+', parser.data.replace(' ', '').replace('\n', ''),
+                         msg='Parser result contains data from before the reset')
+
     @patch('polarion.project.Project')
     def test_links(self, project_mock):
         html_text = '<span class="polarion-rte-link" data-type="workItem" id="fake" data-item-id="PYTH-510" data-option-id="long"></span>' \
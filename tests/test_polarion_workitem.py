@@ -63,6 +63,23 @@ class TestPolarionWorkitem(unittest.TestCase):
         self.assertEqual(executed_workitem, checking_workitem,
                          msg='Workitems not identical')
 
+    def test_title_change_without_reload(self):
+        executed_workitem = self.executing_project.createWorkitem('task')
+
+        executed_workitem.title = 'Unit test item ' + datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        executed_workitem.save(reload=False)
+        checking_workitem = self.checking_project.getWorkitem(
+            executed_workitem.id)
+        self.assertEqual(executed_workitem.title, checking_workitem.title, msg='Title not saved')
+
+        # a second save without changes should not send anything, a new change should be sent
+        executed_workitem.save(reload=False)
+        executed_workitem.title = 'Second ' + executed_workitem.title
+        executed_workitem.save(reload=False)
+        checking_workitem = self.checking_project.getWorkitem(
+            executed_workitem.id)
+        self.assertEqual(executed_workitem.title, checking_workitem.title, msg='Second title not saved')
+
     def test_description_change(self):
         executed_workitem = self.global_workitem
         new_description = 'new description on ' + \
@@ -411,6 +428,20 @@ class TestPolarionWorkitem(unittest.TestCase):
 
         self.assertRaises(Exception, executed_workitem_1.setCustomField, 'random_invalid_key', 0)
 
+    def test_custom_fields(self):
+        executed_workitem_1 = self.executing_project.createWorkitem('task')
+
+        executed_workitem_1.setCustomFields({'int_field': 12, 'string_field': '12'})
+
+        checking_workitem_1 = self.checking_project.getWorkitem(executed_workitem_1.id)
+        self.assertEqual(12, checking_workitem_1.customFields.Custom[0].value, msg='value not the same as set')
+        self.assertEqual('12', checking_workitem_1.customFields.Custom[1].value, msg='value not the same as set')
+
+        self.assertRaises(Exception, executed_workitem_1.setCustomFields, {'int_field': 24, 'random_invalid_key': 0})
+
+        checking_workitem_1 = self.checking_project.getWorkitem(executed_workitem_1.id)
+        self.assertEqual(12, checking_workitem_1.customFields.Custom[0].value, msg='value changed by a rejected set')
+
     def test_approvee(self):
         executed_workitem_1 = self.executing_project.createWorkitem('task')
         all_users = self.executing_project.getUsers()